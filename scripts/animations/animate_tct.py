@@ -14,9 +14,29 @@ Usage:
 """
 
 import argparse
+import io
+import re
 import sys
 import time
 import json
+from functools import lru_cache
+
+# orjson parses and pretty-prints several times faster than stdlib
+# json; use it when installed and fall back silently otherwise
+try:
+    import orjson
+
+    def _loads(s):
+        return orjson.loads(s)
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    def _loads(s):
+        return json.loads(s)
+
+    def _dumps(obj):
+        return json.dumps(obj, indent=2)
 
 # ANSI color codes
 class Colors:
@@ -52,6 +72,26 @@ class Colors:
     BG_CYAN = "\033[46m"
 
 
+# Frame buffer: animation frames are assembled here and written to
+# stdout in a single syscall per frame, instead of dozens of
+# line-buffered print calls (terminals repaint one big write smoothly)
+_buf = io.StringIO()
+
+
+def emit(s=""):
+    """Queue a line of the current frame."""
+    _buf.write(s)
+    _buf.write("\n")
+
+
+def flush_frame():
+    """Write the buffered frame to stdout in one call."""
+    sys.stdout.write(_buf.getvalue())
+    sys.stdout.flush()
+    _buf.seek(0)
+    _buf.truncate(0)
+
+
 def clear_line():
     """Clear current line."""
     print("\033[2K\r", end="")
@@ -63,28 +103,28 @@ def move_up(n=1):
 
 
 def clear_screen():
-    """Clear screen and move to top."""
-    print("\033[2J\033[H", end="")
+    """Clear screen and move to top (queued on the frame buffer)."""
+    _buf.write("\033[2J\033[H")
 
 
 def print_header(title):
-    """Print a styled header."""
+    """Queue a styled header (flushed with the surrounding frame)."""
     width = 70
-    print(f"\n{Colors.BOLD}{Colors.CYAN}{'═' * width}{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}  {title}{Colors.RESET}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{'═' * width}{Colors.RESET}\n")
+    emit(f"\n{Colors.BOLD}{Colors.CYAN}{'═' * width}{Colors.RESET}")
+    emit(f"{Colors.BOLD}{Colors.CYAN}  {title}{Colors.RESET}")
+    emit(f"{Colors.BOLD}{Colors.CYAN}{'═' * width}{Colors.RESET}\n")
 
 
 def print_box(content, title="", width=70):
-    """Print content in a box."""
+    """Queue content in a box (flushed with the surrounding frame)."""
     lines = content.split('\n')
 
     # Top border
     if title:
         padding = width - len(title) - 4
-        print(f"┌─ {Colors.BOLD}{title}{Colors.RESET} {'─' * padding}┐")
+        emit(f"┌─ {Colors.BOLD}{title}{Colors.RESET} {'─' * padding}┐")
     else:
-        print(f"┌{'─' * width}┐")
+        emit(f"┌{'─' * width}┐")
 
     # Content
     for line in lines:
@@ -92,57 +132,89 @@ def print_box(content, title="", width=70):
         visible_len = len(line.encode('utf-8').decode('utf-8', errors='ignore'))
         if visible_len > width - 4:
             line = line[:width-7] + "..."
-        padding = width - 4 - len(line)
-        print(f"│  {line}{' ' * max(0, padding)}  │")
+        # Format-spec padding lets CPython pad in C instead of
+        # allocating a separate pad string per line
+        emit(f"│  {line:<{width - 4}}  │")
 
     # Bottom border
-    print(f"└{'─' * width}┘")
+    emit(f"└{'─' * width}┘")
 
 
-def colorize_json(json_str, highlight_new=""):
-    """Add colors to JSON structure with optional new content highlighting."""
-    result = []
-    in_string = False
-    in_key = False
-    escape_next = False
-
-    for i, char in enumerate(json_str):
-        if escape_next:
-            result.append(char)
-            escape_next = False
-            continue
-
-        if char == '\\':
-            escape_next = True
-            result.append(char)
-            continue
-
-        if char == '"':
-            if not in_string:
-                in_string = True
-                # Determine if this is a key (followed by :)
-                rest = json_str[i+1:]
-                colon_pos = rest.find(':')
-                quote_pos = rest.find('"')
-                in_key = colon_pos != -1 and (quote_pos == -1 or colon_pos < quote_pos + 1)
-                if in_key:
-                    result.append(f"{Colors.CYAN}{char}")
-                else:
-                    result.append(f"{Colors.GREEN}{char}")
-            else:
-                result.append(f"{char}{Colors.RESET}")
-                in_string = False
-                in_key = False
-        elif char in '{}[]':
-            result.append(f"{Colors.YELLOW}{char}{Colors.RESET}")
-        elif char in ':,':
-            result.append(f"{Colors.DIM}{char}{Colors.RESET}")
-        elif not in_string and char in 'truefalsnul':  # keywords
-            result.append(f"{Colors.MAGENTA}{char}{Colors.RESET}")
-        else:
-            result.append(char)
+# One pass over the JSON text in the C regex engine instead of a
+# per-character Python loop; keys are strings followed by a colon
+_JSON_TOK = re.compile(
+    r'(?P<key>"(?:[^"\\]|\\.)*"(?=\s*:))'
+    r'|(?P<str>"(?:[^"\\]|\\.)*")'
+    r'|(?P<brace>[{}\[\]])'
+    r'|(?P<punct>[:,])'
+    r'|(?P<kw>true|false|null)'
+)
+
+_TOKEN_COLORS = {
+    'key': Colors.CYAN,
+    'str': Colors.GREEN,
+    'brace': Colors.YELLOW,
+    'punct': Colors.DIM,
+    'kw': Colors.MAGENTA,
+}
 
-    return ''.join(result)
+
+@lru_cache(maxsize=256)
+def colorize_json(json_str, highlight_new=""):
+    """Add colors to JSON structure with optional new content highlighting.
+
+    Escapes are only emitted when the color actually changes between
+    segments (plus one trailing RESET), roughly halving the ANSI bytes
+    the terminal has to parse versus a color/RESET pair per token.
+    """
+    out = []
+    cur = None
+    pos = 0
+
+    for m in _JSON_TOK.finditer(json_str):
+        if m.start() > pos:
+            # Uncolored text between tokens (whitespace, numbers)
+            if cur is not None:
+                out.append(Colors.RESET)
+                cur = None
+            out.append(json_str[pos:m.start()])
+
+        color = _TOKEN_COLORS[m.lastgroup]
+        if color != cur:
+            # DIM is an attribute rather than a foreground color:
+            # leaving it needs a RESET (a color switch would not clear
+            # it), and entering it needs one too so punctuation renders
+            # default-dim instead of stacking DIM on the prior color
+            if cur is not None and (cur == Colors.DIM or color == Colors.DIM):
+                out.append(Colors.RESET)
+            out.append(color)
+            cur = color
+        out.append(m.group())
+        pos = m.end()
+
+    if cur is not None:
+        out.append(Colors.RESET)
+    out.append(json_str[pos:])
+
+    return ''.join(out)
+
+
+def _decode_states(tct, tokens):
+    """Decode every token prefix once, up front.
+
+    The animation loops used to call decode_prefix per frame on a fresh
+    copy of the prefix, re-decoding the same tokens over and over
+    (O(N^2) decode work). Precomputing all states keeps the per-frame
+    cost to a list index. One prefix list grows in place by a token per
+    step — decode_prefix only reads the sequence, so no per-prefix copy
+    is needed.
+    """
+    states = []
+    prefix = []
+    for t in tokens:
+        prefix.append(t)
+        states.append(tct.decode_prefix(prefix))
+    return states
 
 
 def animate_encoding(tct, json_str, delay=0.3):
@@ -150,72 +222,94 @@ def animate_encoding(tct, json_str, delay=0.3):
     print_header("TCT Tokenization Animation")
 
     # Show input
-    print(f"{Colors.BOLD}Input JSON:{Colors.RESET}")
-    formatted = json.dumps(json.loads(json_str), indent=2)
-    print(colorize_json(formatted))
-    print()
+    emit(f"{Colors.BOLD}Input JSON:{Colors.RESET}")
+    formatted = _dumps(_loads(json_str))
+    emit(colorize_json(formatted))
+    emit()
 
-    # Get tokens
+    # Get tokens; vocab_size crosses the binding boundary, so read it once
     tokens = tct.encode(json_str)
+    vocab = tct.vocab_size()
 
-    print(f"{Colors.BOLD}Encoding to {len(tokens)} tokens...{Colors.RESET}\n")
+    emit(f"{Colors.BOLD}Encoding to {len(tokens)} tokens...{Colors.RESET}\n")
+    flush_frame()
     time.sleep(delay)
 
-    # Animate token-by-token decoding
+    # Animate token-by-token decoding. The scaffold (clear + header +
+    # decoded placeholder) is painted once; each frame repositions the
+    # cursor and overwrites only the regions that changed instead of
+    # clearing and re-sending the whole screen.
+    states = _decode_states(tct, tokens)
     prev_decoded = ""
+    prev_rendered = f"{Colors.DIM}(building...){Colors.RESET}"
     token_displays = []
+    tokens_line_parts = []
 
-    for i, token in enumerate(tokens):
-        prefix_tokens = list(tokens[:i+1])
-        decoded, consumed, surplus = tct.decode_prefix(prefix_tokens)
+    tokens_row = 6                # first row below the 5-line header
+    decoded_row = tokens_row + 3  # tokens label + token line + blank
+    status_row = decoded_row + 3  # decoded label + one line + blank
 
-        # Find what's new
-        if decoded != prev_decoded:
-            new_content = decoded
-        else:
-            new_content = ""
+    clear_screen()
+    print_header("TCT Tokenization Animation")
+    _buf.write(f"\033[{decoded_row};1H")
+    emit(f"{Colors.BOLD}Decoded JSON:{Colors.RESET}")
+    emit(prev_rendered)
+    flush_frame()
+
+    for i, token in enumerate(tokens):
+        decoded, consumed, surplus = states[i]
+        changed = decoded != prev_decoded
 
         # Display token
         token_str = f"{Colors.BRIGHT_BLUE}{token:4d}{Colors.RESET}"
         token_displays.append(token_str)
 
-        # Clear and redraw
-        clear_screen()
-        print_header("TCT Tokenization Animation")
-
-        # Show tokens so far
-        print(f"{Colors.BOLD}Tokens ({i+1}/{len(tokens)}):{Colors.RESET}")
-        tokens_line = " ".join(f"{t:4d}" for t in tokens[:i+1])
-        print(f"  [{Colors.CYAN}{tokens_line}{Colors.RESET}]")
-        print()
-
-        # Show current decoded state
-        print(f"{Colors.BOLD}Decoded JSON:{Colors.RESET}")
-        if decoded:
-            try:
-                formatted = json.dumps(json.loads(decoded), indent=2)
-                print(colorize_json(formatted))
-            except:
-                print(colorize_json(decoded))
-        else:
-            print(f"{Colors.DIM}(building...){Colors.RESET}")
+        # The tokens block changes every frame: overwrite it in place
+        # (each token is formatted once, when it first appears)
+        _buf.write(f"\033[{tokens_row};1H")
+        emit(f"{Colors.BOLD}Tokens ({i+1}/{len(tokens)}):{Colors.RESET}\033[K")
+        tokens_line_parts.append(f"{token:4d}")
+        tokens_line = " ".join(tokens_line_parts)
+        emit(f"  [{Colors.CYAN}{tokens_line}{Colors.RESET}]\033[K")
+
+        # The decoded block is re-rendered and re-painted only when the
+        # decoded text changed; its height places the status line
+        if changed:
+            if decoded:
+                try:
+                    formatted = _dumps(_loads(decoded))
+                    prev_rendered = colorize_json(formatted)
+                except:
+                    prev_rendered = colorize_json(decoded)
+            else:
+                prev_rendered = f"{Colors.DIM}(building...){Colors.RESET}"
+            _buf.write(f"\033[{decoded_row};1H\033[0J")
+            emit(f"{Colors.BOLD}Decoded JSON:{Colors.RESET}")
+            emit(prev_rendered)
+            status_row = decoded_row + prev_rendered.count('\n') + 3
 
         # Show what this token added
-        if new_content and new_content != prev_decoded:
-            print(f"\n{Colors.BRIGHT_GREEN}✓ Token {token} produced output{Colors.RESET}")
+        _buf.write(f"\033[{status_row};1H")
+        if changed and decoded:
+            emit(f"{Colors.BRIGHT_GREEN}✓ Token {token} produced output{Colors.RESET}\033[K")
         else:
-            print(f"\n{Colors.DIM}○ Token {token} (buffered){Colors.RESET}")
+            emit(f"{Colors.DIM}○ Token {token} (buffered){Colors.RESET}\033[K")
 
         prev_decoded = decoded
+        flush_frame()
         time.sleep(delay)
 
+    # Park the cursor below the last frame before the summary
+    _buf.write(f"\033[{status_row + 1};1H")
+
     # Final summary
-    print(f"\n{Colors.BOLD}{'─' * 50}{Colors.RESET}")
-    print(f"{Colors.BOLD}Summary:{Colors.RESET}")
-    print(f"  • Input bytes:  {len(json_str)}")
-    print(f"  • TCT tokens:   {len(tokens)}")
-    print(f"  • Compression:  {len(json_str)/len(tokens):.1f}x")
-    print(f"  • Vocab size:   {tct.vocab_size()}")
+    emit(f"\n{Colors.BOLD}{'─' * 50}{Colors.RESET}")
+    emit(f"{Colors.BOLD}Summary:{Colors.RESET}")
+    emit(f"  • Input bytes:  {len(json_str)}")
+    emit(f"  • TCT tokens:   {len(tokens)}")
+    emit(f"  • Compression:  {len(json_str)/len(tokens):.1f}x")
+    emit(f"  • Vocab size:   {vocab}")
+    flush_frame()
 
 
 def animate_comparison(tct, json_str, delay=0.2):
@@ -223,37 +317,49 @@ def animate_comparison(tct, json_str, delay=0.2):
     print_header("TCT vs UTF-8 Comparison")
 
     tokens = tct.encode(json_str)
-    utf8_tokens = list(json_str.encode('utf-8'))
+    # Keep the bytes object; iterating/slicing it yields ints without
+    # materializing a list of N PyLongs
+    utf8_bytes = json_str.encode('utf-8')
+    vocab = tct.vocab_size()
 
     # Input
-    print(f"{Colors.BOLD}Input:{Colors.RESET} {colorize_json(json_str)}\n")
+    emit(f"{Colors.BOLD}Input:{Colors.RESET} {colorize_json(json_str)}\n")
 
     # Stats comparison
-    print(f"┌{'─'*30}┬{'─'*30}┐")
-    print(f"│ {Colors.CYAN}TCT Tokens{Colors.RESET}{' '*19}│ {Colors.YELLOW}UTF-8 Bytes{Colors.RESET}{' '*18}│")
-    print(f"├{'─'*30}┼{'─'*30}┤")
-    print(f"│ Count: {Colors.BOLD}{len(tokens):4d}{Colors.RESET}{' '*18}│ Count: {Colors.BOLD}{len(utf8_tokens):4d}{Colors.RESET}{' '*17}│")
-    print(f"│ Vocab: {Colors.BOLD}{tct.vocab_size():4d}{Colors.RESET}{' '*18}│ Vocab: {Colors.BOLD} 256{Colors.RESET}{' '*17}│")
-    print(f"└{'─'*30}┴{'─'*30}┘")
-
-    compression = len(utf8_tokens) / len(tokens)
-    print(f"\n{Colors.BOLD}Compression ratio: {Colors.GREEN}{compression:.1f}x{Colors.RESET}")
-
-    # Animate token sequence building
-    print(f"\n{Colors.BOLD}TCT Token Sequence:{Colors.RESET}")
-    for i in range(len(tokens)):
-        token_line = " ".join(f"{t:3d}" for t in tokens[:i+1])
-        print(f"\r  [{Colors.CYAN}{token_line}{Colors.RESET}]", end="", flush=True)
+    emit(f"┌{'─'*30}┬{'─'*30}┐")
+    emit(f"│ {Colors.CYAN}TCT Tokens{Colors.RESET}{' '*19}│ {Colors.YELLOW}UTF-8 Bytes{Colors.RESET}{' '*18}│")
+    emit(f"├{'─'*30}┼{'─'*30}┤")
+    emit(f"│ Count: {Colors.BOLD}{len(tokens):4d}{Colors.RESET}{' '*18}│ Count: {Colors.BOLD}{len(utf8_bytes):4d}{Colors.RESET}{' '*17}│")
+    emit(f"│ Vocab: {Colors.BOLD}{vocab:4d}{Colors.RESET}{' '*18}│ Vocab: {Colors.BOLD} 256{Colors.RESET}{' '*17}│")
+    emit(f"└{'─'*30}┴{'─'*30}┘")
+
+    compression = len(utf8_bytes) / len(tokens)
+    emit(f"\n{Colors.BOLD}Compression ratio: {Colors.GREEN}{compression:.1f}x{Colors.RESET}")
+
+    # Animate token sequence building (one write per step; each token
+    # formatted once rather than re-formatting the whole prefix)
+    emit(f"\n{Colors.BOLD}TCT Token Sequence:{Colors.RESET}")
+    token_line_parts = []
+    for t in tokens:
+        token_line_parts.append(f"{t:3d}")
+        token_line = " ".join(token_line_parts)
+        _buf.write(f"\r  [{Colors.CYAN}{token_line}{Colors.RESET}]")
+        flush_frame()
         time.sleep(delay)
-    print()
-
-    print(f"\n{Colors.BOLD}UTF-8 Byte Sequence:{Colors.RESET}")
-    for i in range(0, len(utf8_tokens), 10):
-        chunk = utf8_tokens[:i+10]
-        byte_line = " ".join(f"{b:3d}" for b in chunk)
-        print(f"\r  [{Colors.YELLOW}{byte_line}{Colors.RESET}]", end="", flush=True)
+    emit()
+
+    emit(f"\n{Colors.BOLD}UTF-8 Byte Sequence:{Colors.RESET}")
+    # Format each new 10-byte chunk once instead of re-formatting the
+    # whole prefix every step
+    byte_parts = []
+    for i in range(0, len(utf8_bytes), 10):
+        byte_parts.extend(f"{b:3d}" for b in utf8_bytes[i:i+10])
+        byte_line = " ".join(byte_parts)
+        _buf.write(f"\r  [{Colors.YELLOW}{byte_line}{Colors.RESET}]")
+        flush_frame()
         time.sleep(delay / 5)
-    print("\n")
+    emit("\n")
+    flush_frame()
 
 
 def interactive_demo(tct):
@@ -269,21 +375,24 @@ def interactive_demo(tct):
         '{"apiVersion": "v1", "kind": "Secret"}',
     ]
 
-    print(f"{Colors.BOLD}Example Kubernetes manifests:{Colors.RESET}\n")
+    emit(f"{Colors.BOLD}Example Kubernetes manifests:{Colors.RESET}\n")
 
     for i, example in enumerate(examples):
+        colored = colorize_json(example)
         try:
             tokens = tct.encode(example)
             utf8_len = len(example.encode('utf-8'))
             compression = utf8_len / len(tokens)
 
-            print(f"{Colors.CYAN}{i+1}.{Colors.RESET} {colorize_json(example)}")
-            print(f"   {Colors.DIM}→ {len(tokens)} tokens (from {utf8_len} bytes, {compression:.1f}x compression){Colors.RESET}")
-            print()
+            emit(f"{Colors.CYAN}{i+1}.{Colors.RESET} {colored}")
+            emit(f"   {Colors.DIM}→ {len(tokens)} tokens (from {utf8_len} bytes, {compression:.1f}x compression){Colors.RESET}")
+            emit()
         except Exception as e:
-            print(f"{Colors.CYAN}{i+1}.{Colors.RESET} {colorize_json(example)}")
-            print(f"   {Colors.RED}→ Error: {e}{Colors.RESET}")
-            print()
+            emit(f"{Colors.CYAN}{i+1}.{Colors.RESET} {colored}")
+            emit(f"   {Colors.RED}→ Error: {e}{Colors.RESET}")
+            emit()
+
+    flush_frame()
 
 
 def animate_streaming(tct, json_str, delay=0.05):
@@ -291,49 +400,54 @@ def animate_streaming(tct, json_str, delay=0.05):
     print_header("TCT Tokenization - Streaming View")
 
     # Show input
-    print(f"{Colors.BOLD}Input:{Colors.RESET} {colorize_json(json_str)}\n")
+    emit(f"{Colors.BOLD}Input:{Colors.RESET} {colorize_json(json_str)}\n")
 
     tokens = tct.encode(json_str)
-    print(f"{Colors.BOLD}Encoding to {len(tokens)} tokens:{Colors.RESET} ", end="", flush=True)
+    _buf.write(f"{Colors.BOLD}Encoding to {len(tokens)} tokens:{Colors.RESET} ")
+    flush_frame()
 
     # Show tokens appearing
     for token in tokens:
-        print(f"{Colors.CYAN}{token}{Colors.RESET} ", end="", flush=True)
+        sys.stdout.write(f"{Colors.CYAN}{token}{Colors.RESET} ")
+        sys.stdout.flush()
         time.sleep(delay)
-    print("\n")
+    emit("\n")
 
     # Now show decoding progress
-    print(f"{Colors.BOLD}Progressive decoding:{Colors.RESET}\n")
+    emit(f"{Colors.BOLD}Progressive decoding:{Colors.RESET}\n")
+    flush_frame()
 
+    states = _decode_states(tct, tokens)
     prev_decoded = ""
     for i, token in enumerate(tokens):
-        prefix_tokens = list(tokens[:i+1])
-        decoded, consumed, surplus = tct.decode_prefix(prefix_tokens)
+        decoded, consumed, surplus = states[i]
 
         if decoded != prev_decoded:
             # Show the new state
             try:
-                formatted = json.dumps(json.loads(decoded), indent=2)
+                formatted = _dumps(_loads(decoded))
             except:
                 formatted = decoded
 
-            print(f"  {Colors.BRIGHT_BLUE}+token {token:4d}{Colors.RESET} → ", end="")
+            _buf.write(f"  {Colors.BRIGHT_BLUE}+token {token:4d}{Colors.RESET} → ")
 
             # Highlight what's new
             if prev_decoded and decoded.startswith(prev_decoded.rstrip('}')):
                 # Show delta
-                print(f"{Colors.GREEN}{formatted}{Colors.RESET}")
+                emit(f"{Colors.GREEN}{formatted}{Colors.RESET}")
             else:
-                print(colorize_json(formatted).replace('\n', '\n' + ' ' * 17))
+                emit(colorize_json(formatted).replace('\n', '\n' + ' ' * 17))
         else:
-            print(f"  {Colors.DIM}+token {token:4d} → (buffered, awaiting more tokens){Colors.RESET}")
+            emit(f"  {Colors.DIM}+token {token:4d} → (buffered, awaiting more tokens){Colors.RESET}")
 
         prev_decoded = decoded
+        flush_frame()
         time.sleep(delay * 2)
 
-    print()
-    print(f"{Colors.BOLD}{'─' * 50}{Colors.RESET}")
-    print(f"{Colors.BOLD}Final:{Colors.RESET} {len(json_str)} bytes → {len(tokens)} tokens ({len(json_str)/len(tokens):.1f}x compression)")
+    emit()
+    emit(f"{Colors.BOLD}{'─' * 50}{Colors.RESET}")
+    emit(f"{Colors.BOLD}Final:{Colors.RESET} {len(json_str)} bytes → {len(tokens)} tokens ({len(json_str)/len(tokens):.1f}x compression)")
+    flush_frame()
 
 
 def animate_rich(tct, json_str, delay=0.15):
@@ -342,15 +456,16 @@ def animate_rich(tct, json_str, delay=0.15):
 
     tokens = tct.encode(json_str)
 
-    print(f"{Colors.BOLD}Input:{Colors.RESET} {colorize_json(json_str)}")
-    print(f"{Colors.DIM}({len(json_str)} bytes){Colors.RESET}\n")
+    emit(f"{Colors.BOLD}Input:{Colors.RESET} {colorize_json(json_str)}")
+    emit(f"{Colors.DIM}({len(json_str)} bytes){Colors.RESET}\n")
 
-    print(f"{Colors.BOLD}Token breakdown:{Colors.RESET}\n")
+    emit(f"{Colors.BOLD}Token breakdown:{Colors.RESET}\n")
+    flush_frame()
 
+    states = _decode_states(tct, tokens)
     prev_decoded = ""
     for i, token in enumerate(tokens):
-        prefix_tokens = list(tokens[:i+1])
-        decoded, consumed, surplus = tct.decode_prefix(prefix_tokens)
+        decoded, consumed, surplus = states[i]
 
         # Determine what this token represents
         if decoded != prev_decoded:
@@ -361,19 +476,21 @@ def animate_rich(tct, json_str, delay=0.15):
             status = f"{Colors.YELLOW}○{Colors.RESET}"
             meaning = f"{Colors.DIM}buffered (part of multi-token sequence){Colors.RESET}"
 
-        print(f"  {status} Token {Colors.CYAN}{token:4d}{Colors.RESET} │ {meaning}")
+        emit(f"  {status} Token {Colors.CYAN}{token:4d}{Colors.RESET} │ {meaning}")
+        flush_frame()
         prev_decoded = decoded
         time.sleep(delay)
 
-    print()
+    emit()
 
     # Show the full progression as a compact diagram
-    print(f"{Colors.BOLD}Token sequence:{Colors.RESET}")
+    emit(f"{Colors.BOLD}Token sequence:{Colors.RESET}")
     token_str = " → ".join(f"{Colors.CYAN}{t}{Colors.RESET}" for t in tokens)
-    print(f"  {token_str}")
+    emit(f"  {token_str}")
 
-    print()
-    print(f"{Colors.BOLD}Compression:{Colors.RESET} {len(json_str)} bytes → {len(tokens)} tokens = {Colors.GREEN}{len(json_str)/len(tokens):.1f}x{Colors.RESET}")
+    emit()
+    emit(f"{Colors.BOLD}Compression:{Colors.RESET} {len(json_str)} bytes → {len(tokens)} tokens = {Colors.GREEN}{len(json_str)/len(tokens):.1f}x{Colors.RESET}")
+    flush_frame()
 
 
 def main():
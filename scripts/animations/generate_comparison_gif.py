@@ -5,6 +5,10 @@ Shows the dramatic difference in token counts side by side.
 """
 
 import argparse
+import multiprocessing
+import os
+from functools import lru_cache
+
 from PIL import Image, ImageDraw, ImageFont
 
 
@@ -29,18 +33,27 @@ def hex_to_rgb(hex_color: str) -> tuple:
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
+# RGB tuples precomputed once so frame drawing does plain dict lookups
+COLORS_RGB = {k: hex_to_rgb(v) for k, v in COLORS.items()}
+
+
+# First monospace font that exists, resolved once at import so
+# get_font doesn't re-walk the candidate paths for every size
+_FONT_PATH = next((p for p in [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
+    "/usr/share/fonts/TTF/DejaVuSansMono.ttf",
+    "/System/Library/Fonts/Menlo.ttc",
+] if os.path.exists(p)), None)
+
+
+@lru_cache(maxsize=16)
 def get_font(size: int) -> ImageFont.FreeTypeFont:
-    font_paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
-        "/usr/share/fonts/TTF/DejaVuSansMono.ttf",
-        "/System/Library/Fonts/Menlo.ttc",
-    ]
-    for path in font_paths:
+    if _FONT_PATH:
         try:
-            return ImageFont.truetype(path, size)
+            return ImageFont.truetype(_FONT_PATH, size)
         except (IOError, OSError):
-            continue
+            pass
     return ImageFont.load_default()
 
 
@@ -50,17 +63,17 @@ def draw_token_bar(draw, x, y, width, count, max_count, color, label, font, font
     bar_width = int((count / max_count) * width) if max_count > 0 else 0
 
     # Background bar
-    draw.rectangle([x, y, x + width, y + bar_height], fill=hex_to_rgb(COLORS['box_bg']))
+    draw.rectangle([x, y, x + width, y + bar_height], fill=COLORS_RGB['box_bg'])
 
     # Filled bar
     if bar_width > 0:
-        draw.rectangle([x, y, x + bar_width, y + bar_height], fill=hex_to_rgb(color))
+        draw.rectangle([x, y, x + bar_width, y + bar_height], fill=color)
 
     # Label and count
-    draw.text((x, y - 22), label, font=font_small, fill=hex_to_rgb(color))
+    draw.text((x, y - 22), label, font=font_small, fill=color)
     if count > 0:
         count_text = f"{count} tokens"
-        draw.text((x + bar_width + 10, y + 8), count_text, font=font, fill=hex_to_rgb(COLORS['text']))
+        draw.text((x + bar_width + 10, y + 8), count_text, font=font, fill=COLORS_RGB['text'])
 
 
 def create_comparison_frame(
@@ -77,33 +90,33 @@ def create_comparison_frame(
 ) -> Image.Image:
     """Create a single frame comparing TCT vs UTF-8."""
 
-    img = Image.new('RGB', (width, height), hex_to_rgb(COLORS['bg']))
+    img = Image.new('RGB', (width, height), COLORS_RGB['bg'])
     draw = ImageDraw.Draw(img)
 
     padding = 30
     y = padding
 
     # Title
-    draw.text((padding, y), "TCT vs UTF-8 Tokenization", font=font_title, fill=hex_to_rgb(COLORS['text']))
+    draw.text((padding, y), "TCT vs UTF-8 Tokenization", font=font_title, fill=COLORS_RGB['text'])
     y += 40
 
     # Separator
-    draw.line([(padding, y), (width - padding, y)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, y), (width - padding, y)], fill=COLORS_RGB['border'], width=1)
     y += 20
 
     # Input JSON (truncated if needed)
-    draw.text((padding, y), "Input JSON:", font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+    draw.text((padding, y), "Input JSON:", font=font_small, fill=COLORS_RGB['text_dim'])
     y += 20
 
     display_json = json_str if len(json_str) < 80 else json_str[:77] + "..."
-    draw.text((padding, y), display_json, font=font, fill=hex_to_rgb(COLORS['text']))
+    draw.text((padding, y), display_json, font=font, fill=COLORS_RGB['text'])
     y += 30
 
-    draw.text((padding, y), f"({len(json_str)} bytes)", font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+    draw.text((padding, y), f"({len(json_str)} bytes)", font=font_small, fill=COLORS_RGB['text_dim'])
     y += 35
 
     # Separator
-    draw.line([(padding, y), (width - padding, y)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, y), (width - padding, y)], fill=COLORS_RGB['border'], width=1)
     y += 25
 
     # Token comparison bars
@@ -112,30 +125,59 @@ def create_comparison_frame(
 
     # TCT bar
     draw_token_bar(draw, padding, y, bar_width, tct_visible, max_count,
-                   COLORS['tct'], "TCT Tokens", font, font_small)
+                   COLORS_RGB['tct'], "TCT Tokens", font, font_small)
     y += 60
 
     # UTF-8 bar
     draw_token_bar(draw, padding, y, bar_width, utf8_visible, max_count,
-                   COLORS['utf8'], "UTF-8 Bytes", font, font_small)
+                   COLORS_RGB['utf8'], "UTF-8 Bytes", font, font_small)
     y += 70
 
     # Compression ratio
     if tct_visible > 0 and utf8_visible > 0:
         ratio = utf8_visible / tct_visible
         ratio_text = f"Compression: {ratio:.1f}x fewer tokens with TCT"
-        draw.text((padding, y), ratio_text, font=font, fill=hex_to_rgb(COLORS['success']))
+        draw.text((padding, y), ratio_text, font=font, fill=COLORS_RGB['success'])
 
     # Final stats at bottom
     stats_y = height - 40
-    draw.line([(padding, stats_y - 15), (width - padding, stats_y - 15)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, stats_y - 15), (width - padding, stats_y - 15)], fill=COLORS_RGB['border'], width=1)
 
     final_text = f"Final: {len(tct_tokens)} TCT tokens vs {len(utf8_bytes)} UTF-8 bytes"
-    draw.text((padding, stats_y), final_text, font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+    draw.text((padding, stats_y), final_text, font=font_small, fill=COLORS_RGB['text_dim'])
 
     return img
 
 
+# Per-process render state; fonts don't pickle, so Pool workers rebuild
+# them from the plain arguments via the initializer
+_RENDER = {}
+
+
+def _init_render_state(width, height, json_str, tct_tokens, utf8_bytes):
+    """Build the shared render state for this process."""
+    _RENDER.update(
+        width=width, height=height, json_str=json_str,
+        tct_tokens=tct_tokens, utf8_bytes=utf8_bytes,
+        fonts=(get_font(14), get_font(12), get_font(18)),
+    )
+
+
+def _render_state(state):
+    """Render one (tct_visible, utf8_visible) frame."""
+    tct_visible, utf8_visible = state
+    font, font_small, font_title = _RENDER['fonts']
+    return create_comparison_frame(
+        _RENDER['width'], _RENDER['height'],
+        _RENDER['json_str'],
+        _RENDER['tct_tokens'],
+        _RENDER['utf8_bytes'],
+        tct_visible,
+        utf8_visible,
+        font, font_small, font_title
+    )
+
+
 def generate_comparison_animation(
     json_str: str,
     tct_tokens: list,
@@ -146,17 +188,15 @@ def generate_comparison_animation(
 ):
     """Generate the comparison animated GIF."""
 
-    font = get_font(14)
-    font_small = get_font(12)
-    font_title = get_font(18)
-
     utf8_bytes = list(json_str.encode('utf-8'))
 
-    frames = []
+    states = []
+    durations = []
 
     # Animate both filling up simultaneously, but UTF-8 fills faster
     # to show the dramatic difference
     total_steps = 40
+    prev_state = None
     for step in range(total_steps + 1):
         progress = step / total_steps
 
@@ -166,27 +206,37 @@ def generate_comparison_animation(
         # TCT fills at the same rate proportionally
         tct_visible = int(len(tct_tokens) * progress)
 
-        frame = create_comparison_frame(
-            width, height,
-            json_str,
-            tct_tokens,
-            utf8_bytes,
-            tct_visible,
-            utf8_visible,
-            font, font_small, font_title
-        )
-        frames.append(frame)
-
-    # Hold final frame
-    for _ in range(20):
-        frames.append(frames[-1])
+        # Low progress steps often round to the same counts; extend the
+        # previous frame's display time instead of re-rendering and
+        # re-encoding identical pixels
+        if (tct_visible, utf8_visible) == prev_state:
+            durations[-1] += frame_duration
+            continue
+        prev_state = (tct_visible, utf8_visible)
+
+        states.append(prev_state)
+        durations.append(frame_duration)
+
+    # Hold the final frame via its duration instead of appending 20
+    # duplicates the encoder would re-encode
+    durations[-1] = frame_duration * 21
+
+    # Frames are pure functions of their state: fan rendering out across
+    # cores and assemble in order
+    init_args = (width, height, json_str, tct_tokens, utf8_bytes)
+    if multiprocessing.cpu_count() > 1:
+        with multiprocessing.Pool(initializer=_init_render_state, initargs=init_args) as pool:
+            frames = pool.map(_render_state, states, chunksize=4)
+    else:
+        _init_render_state(*init_args)
+        frames = [_render_state(s) for s in states]
 
     # Save
     frames[0].save(
         output_path,
         save_all=True,
         append_images=frames[1:],
-        duration=frame_duration,
+        duration=durations,
         loop=0
     )
 
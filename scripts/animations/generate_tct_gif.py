@@ -11,6 +11,13 @@ This creates a visual animation showing:
 
 import argparse
 import json
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+from functools import lru_cache
+
 from PIL import Image, ImageDraw, ImageFont
 from typing import Optional
 
@@ -31,12 +38,31 @@ COLORS = {
 }
 
 
+@lru_cache(maxsize=None)
 def hex_to_rgb(hex_color: str) -> tuple:
     """Convert hex color to RGB tuple."""
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
+# RGB tuples precomputed once so frame drawing does plain dict lookups
+COLORS_RGB = {k: hex_to_rgb(v) for k, v in COLORS.items()}
+
+
+def make_palette() -> Image.Image:
+    """Build a fixed palette image covering the theme colors.
+
+    Quantizing every frame against the same palette skips Pillow's
+    per-frame adaptive quantization and keeps indices stable across
+    frames, which lets the GIF encoder emit small deltas.
+    """
+    pal = Image.new('P', (1, 1))
+    flat = [c for rgb in COLORS_RGB.values() for c in rgb]
+    pal.putpalette(flat + [0] * (768 - len(flat)))
+    return pal
+
+
+@lru_cache(maxsize=None)
 def get_font(size: int) -> ImageFont.FreeTypeFont:
     """Get a monospace font, falling back to default if needed."""
     font_paths = [
@@ -57,121 +83,208 @@ def get_font(size: int) -> ImageFont.FreeTypeFont:
     return ImageFont.load_default()
 
 
-def create_frame(
+@lru_cache(maxsize=32)
+def _mono_w(font: ImageFont.FreeTypeFont) -> int:
+    """Advance width of one glyph; get_font only returns monospace fonts,
+    so segment widths are a multiplication instead of a textbbox call."""
+    bbox = font.getbbox('M')
+    return bbox[2] - bbox[0]
+
+
+# Token box geometry
+PADDING = 25
+TOKEN_BOX_WIDTH = 48
+TOKEN_BOX_HEIGHT = 28
+TOKEN_SPACING = 56
+
+
+@lru_cache(maxsize=128)
+def _render_json_tile(json_str: str, font: ImageFont.FreeTypeFont, max_width: int) -> tuple:
+    """Rasterize syntax-highlighted JSON once into a transparent tile.
+
+    Returns (tile, height). Cached so the invariant input JSON and
+    repeated decoded states are only colorized and drawn once.
+    """
+    # Generous allocation; cropped to the actual height after drawing
+    est_height = 18 * (len(json_str) // 20 + 2)
+    tile = Image.new('RGBA', (max_width, est_height), (0, 0, 0, 0))
+    height = draw_json_colored(ImageDraw.Draw(tile), 0, 0, json_str, font, max_width)
+    return tile.crop((0, 0, max_width, height)), height
+
+
+def _paste_json(img: Image.Image, x: int, y: int, json_str: str, font: ImageFont.FreeTypeFont, max_width: int) -> int:
+    """Paste the cached JSON tile onto a frame; returns the height used."""
+    tile, height = _render_json_tile(json_str, font, max_width)
+    img.paste(tile, (x, y), tile)
+    return height
+
+
+def _draw_static(
+    img: Image.Image,
     width: int,
     height: int,
     title: str,
     input_json: str,
     tokens: list,
-    visible_tokens: int,
-    decoded_json: str,
-    step_info: str,
     font: ImageFont.FreeTypeFont,
     font_small: ImageFont.FreeTypeFont,
     font_title: ImageFont.FreeTypeFont,
-    utf8_byte_count: int = 0,
-) -> Image.Image:
-    """Create a single frame of the animation."""
+) -> dict:
+    """Draw the chrome that is identical on every frame.
 
-    img = Image.new('RGB', (width, height), hex_to_rgb(COLORS['bg']))
-    draw = ImageDraw.Draw(img)
+    Returns a layout dict with the y positions the dynamic pass needs.
+    """
 
-    padding = 25
+    draw = ImageDraw.Draw(img)
+    padding = PADDING
     y = padding
 
     # Title with subtle underline
-    draw.text((padding, y), title, font=font_title, fill=hex_to_rgb(COLORS['text']))
+    draw.text((padding, y), title, font=font_title, fill=COLORS_RGB['text'])
     y += 35
-    draw.line([(padding, y), (width - padding, y)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, y), (width - padding, y)], fill=COLORS_RGB['border'], width=1)
     y += 15
 
     # Input section
-    draw.text((padding, y), "Input JSON:", font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+    draw.text((padding, y), "Input JSON:", font=font_small, fill=COLORS_RGB['text_dim'])
     y += 22
 
     # Draw input JSON with syntax highlighting
-    json_height = draw_json_colored(draw, padding, y, input_json, font, width - 2 * padding)
+    json_height = _paste_json(img, padding, y, input_json, font, width - 2 * padding)
     y += max(json_height, 20)
 
-    # Tokens section header with count
-    token_label = f"TCT Tokens ({visible_tokens}/{len(tokens)}):"
-    draw.text((padding, y), token_label, font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+    label_y = y
     y += 25
-
-    # Draw token boxes
-    token_x = padding
-    token_box_width = 48
-    token_box_height = 28
-    token_spacing = 56
+    tokens_y = y
 
     # Calculate how many tokens fit per row
-    tokens_per_row = (width - 2 * padding) // token_spacing
+    tokens_per_row = (width - 2 * padding) // TOKEN_SPACING
 
-    for i, token in enumerate(tokens):
+    # Empty placeholder slots (filled boxes get drawn over these per frame)
+    for i in range(len(tokens)):
         row = i // tokens_per_row
         col = i % tokens_per_row
-        x = token_x + col * token_spacing
-        current_y = y + row * (token_box_height + 8)
-
-        if i < visible_tokens:
-            # Draw filled box with rounded corners effect
-            draw.rectangle(
-                [x, current_y, x + token_box_width, current_y + token_box_height],
-                fill=hex_to_rgb(COLORS['token_bg']),
-                outline=hex_to_rgb(COLORS['token']),
-                width=2
-            )
-            # Draw token number
-            token_str = str(token)
-            bbox = draw.textbbox((0, 0), token_str, font=font)
-            text_width = bbox[2] - bbox[0]
-            draw.text(
-                (x + (token_box_width - text_width) // 2, current_y + 4),
-                token_str,
-                font=font,
-                fill=hex_to_rgb(COLORS['token'])
-            )
-
-            # Highlight the newest token with glow effect
-            if i == visible_tokens - 1:
-                for offset in [4, 2]:
-                    alpha = 100 if offset == 4 else 180
-                    draw.rectangle(
-                        [x - offset, current_y - offset, x + token_box_width + offset, current_y + token_box_height + offset],
-                        outline=hex_to_rgb(COLORS['highlight']),
-                        width=1
-                    )
-        else:
-            # Draw empty placeholder
-            draw.rectangle(
-                [x, current_y, x + token_box_width, current_y + token_box_height],
-                fill=hex_to_rgb(COLORS['bg']),
-                outline=hex_to_rgb(COLORS['border']),
-                width=1
-            )
+        x = padding + col * TOKEN_SPACING
+        current_y = tokens_y + row * (TOKEN_BOX_HEIGHT + 8)
+        draw.rectangle(
+            [x, current_y, x + TOKEN_BOX_WIDTH, current_y + TOKEN_BOX_HEIGHT],
+            fill=COLORS_RGB['bg'],
+            outline=COLORS_RGB['border'],
+            width=1
+        )
 
     # Calculate rows used for tokens
     num_rows = (len(tokens) + tokens_per_row - 1) // tokens_per_row
-    y += num_rows * (token_box_height + 8) + 15
+    y += num_rows * (TOKEN_BOX_HEIGHT + 8) + 15
 
     # Separator
-    draw.line([(padding, y), (width - padding, y)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, y), (width - padding, y)], fill=COLORS_RGB['border'], width=1)
     y += 15
 
     # Output section
-    draw.text((padding, y), "Decoded JSON:", font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+    draw.text((padding, y), "Decoded JSON:", font=font_small, fill=COLORS_RGB['text_dim'])
     y += 22
-
-    # Draw decoded JSON
-    if decoded_json:
-        draw_json_colored(draw, padding, y, decoded_json, font, width - 2 * padding)
-    else:
-        draw.text((padding, y), "(waiting for tokens...)", font=font,
-                  fill=hex_to_rgb(COLORS['text_dim']))
+    decoded_y = y
 
     # Stats bar at bottom
     stats_y = height - 45
-    draw.line([(padding, stats_y - 10), (width - padding, stats_y - 10)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, stats_y - 10), (width - padding, stats_y - 10)], fill=COLORS_RGB['border'], width=1)
+
+    # Progress bar background
+    progress_y = height - 18
+    progress_width = width - 2 * padding
+    draw.rectangle(
+        [padding, progress_y, padding + progress_width, progress_y + 6],
+        fill=COLORS_RGB['token_bg']
+    )
+
+    return {
+        'label_y': label_y,
+        'tokens_y': tokens_y,
+        'tokens_per_row': tokens_per_row,
+        'decoded_y': decoded_y,
+        'stats_y': stats_y,
+        'progress_y': progress_y,
+        'progress_width': progress_width,
+    }
+
+
+def _token_layout(tokens: list, tokens_per_row: int, tokens_y: int, font: ImageFont.FreeTypeFont) -> list:
+    """Precompute box position, centered text offset and label per token."""
+    layout = []
+    for i, token in enumerate(tokens):
+        row, col = divmod(i, tokens_per_row)
+        x = PADDING + col * TOKEN_SPACING
+        y = tokens_y + row * (TOKEN_BOX_HEIGHT + 8)
+        token_str = str(token)
+        text_width = _mono_w(font) * len(token_str)
+        layout.append((x, y, (TOKEN_BOX_WIDTH - text_width) // 2, token_str))
+    return layout
+
+
+def _draw_dynamic(
+    img: Image.Image,
+    width: int,
+    layout: dict,
+    tokens: list,
+    token_layout: list,
+    visible_tokens: int,
+    decoded_json: str,
+    font: ImageFont.FreeTypeFont,
+    font_small: ImageFont.FreeTypeFont,
+    utf8_byte_count: int = 0,
+) -> None:
+    """Draw the animated parts on top of the static base."""
+
+    draw = ImageDraw.Draw(img)
+    padding = PADDING
+
+    # Tokens section header with count
+    token_label = f"TCT Tokens ({visible_tokens}/{len(tokens)}):"
+    draw.text((padding, layout['label_y']), token_label, font=font_small, fill=COLORS_RGB['text_dim'])
+
+    # Bind hot names to locals: the loop body runs per token per frame
+    # and LOAD_FAST beats repeated attribute/dict lookups
+    _rect = draw.rectangle
+    _text = draw.text
+    _token_bg = COLORS_RGB['token_bg']
+    _token = COLORS_RGB['token']
+
+    # Draw the visible token boxes
+    for i in range(visible_tokens):
+        x, current_y, text_x, token_str = token_layout[i]
+
+        # Draw filled box with rounded corners effect
+        _rect(
+            [x, current_y, x + TOKEN_BOX_WIDTH, current_y + TOKEN_BOX_HEIGHT],
+            fill=_token_bg,
+            outline=_token,
+            width=2
+        )
+        # Draw token number
+        _text(
+            (x + text_x, current_y + 4),
+            token_str,
+            font=font,
+            fill=_token
+        )
+
+        # Highlight the newest token with a single 2px outline (the old
+        # two-pass loop drew concentric 1px rectangles; alpha is ignored
+        # on RGB images anyway)
+        if i == visible_tokens - 1:
+            _rect(
+                [x - 4, current_y - 4, x + TOKEN_BOX_WIDTH + 4, current_y + TOKEN_BOX_HEIGHT + 4],
+                outline=COLORS_RGB['highlight'],
+                width=2
+            )
+
+    # Draw decoded JSON (cache hits whenever the decoded state repeats)
+    if decoded_json:
+        _paste_json(img, padding, layout['decoded_y'], decoded_json, font, width - 2 * padding)
+    else:
+        draw.text((padding, layout['decoded_y']), "(waiting for tokens...)", font=font,
+                  fill=COLORS_RGB['text_dim'])
 
     # Draw compression comparison
     if visible_tokens > 0 and utf8_byte_count > 0:
@@ -180,113 +293,122 @@ def create_frame(
     else:
         stats_text = f"? bytes → ? tokens"
 
-    draw.text((padding, stats_y), stats_text, font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+    draw.text((padding, layout['stats_y']), stats_text, font=font_small, fill=COLORS_RGB['text_dim'])
 
-    # Progress bar
-    progress_y = height - 18
-    progress_width = width - 2 * padding
+    # Progress bar fill
     progress = visible_tokens / len(tokens) if tokens else 0
-
-    # Background
-    draw.rectangle(
-        [padding, progress_y, padding + progress_width, progress_y + 6],
-        fill=hex_to_rgb(COLORS['token_bg'])
-    )
-    # Fill
     if progress > 0:
         draw.rectangle(
-            [padding, progress_y, padding + int(progress_width * progress), progress_y + 6],
-            fill=hex_to_rgb(COLORS['token'])
+            [padding, layout['progress_y'],
+             padding + int(layout['progress_width'] * progress), layout['progress_y'] + 6],
+            fill=COLORS_RGB['token']
         )
 
-    return img
+
+# Single-pass JSON lexer: keys are strings followed by a colon, handled
+# by the lookahead, so no per-character state machine is needed
+_JSON_LEX = re.compile(
+    r'(?P<key>"(?:[^"\\]|\\.)*"(?=\s*:))'
+    r'|(?P<str>"(?:[^"\\]|\\.)*")'
+    r'|(?P<brk>[{}\[\]])'
+    r'|(?P<punct>[:,])'
+    r'|(?P<ws>\s+)'
+    r'|(?P<rest>[^"{}\[\]:,\s]+)'
+)
+
+_SEGMENT_COLORS = {
+    'key': COLORS['json_key'],
+    'str': COLORS['json_value'],
+    'brk': COLORS['json_bracket'],
+    'punct': COLORS['text_dim'],
+}
 
 
 def draw_json_colored(draw: ImageDraw.Draw, x: int, y: int, json_str: str, font: ImageFont.FreeTypeFont, max_width: int = 650):
     """Draw JSON with syntax highlighting, with word wrap."""
-    lines = []
-    current_line = []
-    current_line_width = 0
-
-    # First, tokenize the JSON into colored segments
-    segments = []
-    in_string = False
-    in_key = False
-    escape_next = False
-    current_text = []
-    current_color = COLORS['text']
-
-    def flush_segment():
-        nonlocal current_text
-        if current_text:
-            text = ''.join(current_text)
-            segments.append((text, current_color))
-            current_text = []
-
-    for i, char in enumerate(json_str):
-        if escape_next:
-            current_text.append(char)
-            escape_next = False
-            continue
 
-        if char == '\\':
-            escape_next = True
-            current_text.append(char)
-            continue
-
-        if char == '"':
-            if not in_string:
-                flush_segment()
-                in_string = True
-                rest = json_str[i+1:]
-                colon_pos = rest.find(':')
-                quote_pos = rest.find('"')
-                in_key = colon_pos != -1 and (quote_pos == -1 or colon_pos < quote_pos + 1)
-                current_color = COLORS['json_key'] if in_key else COLORS['json_value']
-                current_text.append(char)
-            else:
-                current_text.append(char)
-                flush_segment()
-                in_string = False
-                in_key = False
-                current_color = COLORS['text']
-        elif char in '{}[]':
-            flush_segment()
-            current_color = COLORS['json_bracket']
-            current_text.append(char)
-            flush_segment()
-            current_color = COLORS['text']
-        elif not in_string and char in ':,':
-            flush_segment()
-            current_color = COLORS['text_dim']
-            current_text.append(char)
-            flush_segment()
-            current_color = COLORS['text']
-        else:
-            current_text.append(char)
-
-    flush_segment()
+    # Tokenize the JSON into colored segments in one compiled-regex pass
+    segments = [
+        (m.group(), _SEGMENT_COLORS.get(m.lastgroup, COLORS['text']))
+        for m in _JSON_LEX.finditer(json_str)
+    ]
 
     # Now draw segments, wrapping if needed
     cursor_x = x
     cursor_y = y
     line_height = 18
 
+    # Locals for the per-segment loop (LOAD_FAST vs attribute lookups)
+    glyph_w = _mono_w(font)
+    _text = draw.text
+    _rgb = hex_to_rgb
+
     for text, color in segments:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
+        text_width = glyph_w * len(text)
 
         # Check if we need to wrap
         if cursor_x + text_width > x + max_width and cursor_x > x:
             cursor_x = x + 20  # Indent continuation
             cursor_y += line_height
 
-        draw.text((cursor_x, cursor_y), text, font=font, fill=hex_to_rgb(color))
+        _text((cursor_x, cursor_y), text, font=font, fill=_rgb(color))
         cursor_x += text_width
 
     return cursor_y - y + line_height  # Return height used
 
 
+# Per-process render state (base raster, fonts, layout, palette), built
+# once by _init_render_state in each worker; fonts and images do not
+# pickle, so workers reconstruct them from the plain arguments instead
+_RENDER = {}
+
+
+def _init_render_state(width: int, height: int, json_str: str, tokens: list) -> None:
+    """Build the specialized per-frame renderer for this process.
+
+    Everything constant across the run (base raster, fonts, layout,
+    token positions, palette) is partially evaluated into a closure, so
+    the per-frame call carries only the animated spec.
+    """
+    font = get_font(14)
+    font_small = get_font(12)
+    font_title = get_font(18)
+
+    # Rasterize the static chrome (title, input JSON, empty slots) once
+    base = Image.new('RGB', (width, height), COLORS_RGB['bg'])
+    layout = _draw_static(
+        base, width, height,
+        "Type-Constrained Tokenization (TCT)",
+        json_str, tokens,
+        font, font_small, font_title
+    )
+
+    # Box positions and centered text offsets are the same on every frame
+    token_layout = _token_layout(tokens, layout['tokens_per_row'], layout['tokens_y'], font)
+    palette = make_palette()
+
+    def render(spec: tuple) -> Image.Image:
+        visible_tokens, decoded_json, utf8_byte_count = spec
+        frame = base.copy()
+        _draw_dynamic(
+            frame, width, layout,
+            tokens, token_layout, visible_tokens, decoded_json,
+            font, font_small, utf8_byte_count
+        )
+        return frame.quantize(palette=palette, dither=Image.Dither.NONE)
+
+    _RENDER['render'] = render
+
+
+def _render_spec(spec: tuple) -> Image.Image:
+    """Render one (visible_tokens, decoded_json, utf8_byte_count) frame.
+
+    Module-level so Pool can pickle the reference; the real work happens
+    in the closure built by _init_render_state.
+    """
+    return _RENDER['render'](spec)
+
+
 def generate_animation(
     json_str: str,
     tokens: list,
@@ -298,70 +420,69 @@ def generate_animation(
 ):
     """Generate the animated GIF."""
 
-    font = get_font(14)
-    font_small = get_font(12)
-    font_title = get_font(18)
-
-    frames = []
-
-    # Initial frame (no tokens)
-    frame = create_frame(
-        width, height,
-        "Type-Constrained Tokenization (TCT)",
-        json_str,
-        tokens,
-        0,
-        "",
-        "",
-        font, font_small, font_title,
-        0  # No bytes decoded yet
-    )
-    frames.append(frame)
+    # Frame specs: (visible_tokens, decoded_json, utf8_byte_count)
+    specs = [(0, "", 0)]  # Initial frame (no tokens)
 
     # One frame per token
     for i, (decoded, token) in enumerate(decoded_states):
         decoded_bytes = len(decoded.encode('utf-8')) if decoded else 0
-        frame = create_frame(
-            width, height,
-            "Type-Constrained Tokenization (TCT)",
-            json_str,
-            tokens,
-            i + 1,
-            decoded or "{}",
-            "",
-            font, font_small, font_title,
-            decoded_bytes
-        )
-        frames.append(frame)
+        specs.append((i + 1, decoded or "{}", decoded_bytes))
 
     # Final frame (hold longer) - same as last but will be held
     final_decoded = decoded_states[-1][0] if decoded_states else "{}"
     final_bytes = len(final_decoded.encode('utf-8')) if final_decoded else 0
-    frame = create_frame(
-        width, height,
-        "Type-Constrained Tokenization (TCT)",
-        json_str,
-        tokens,
-        len(tokens),
-        final_decoded,
-        "",
-        font, font_small, font_title,
-        final_bytes
-    )
-    frames.append(frame)
+    specs.append((len(tokens), final_decoded, final_bytes))
+
+    durations = [frame_duration] * (len(specs) - 1) + [frame_duration * 3]  # Hold last frame longer
+
+    def encode(frames):
+        # Frames stream into the encoder one at a time, keeping peak
+        # memory at a single frame. All frames share the fixed palette
+        # (default disposal keeps the previous frame), so the encoder
+        # stores only the changed sub-rectangle per frame — typically
+        # just the moving glow, the newest token box and the decoded
+        # JSON region rather than the full canvas.
+        next(frames).save(
+            output_path,
+            save_all=True,
+            append_images=frames,
+            duration=durations,
+            loop=0,  # Loop forever
+            optimize=False  # frames are already on the minimal fixed palette
+        )
 
-    # Save as GIF
-    durations = [frame_duration] * (len(frames) - 1) + [frame_duration * 3]  # Hold last frame longer
+    # Frames are pure functions of their spec: fan rendering out across
+    # cores and assemble in order (imap preserves ordering)
+    init_args = (width, height, json_str, tokens)
+    if multiprocessing.cpu_count() > 1:
+        with multiprocessing.Pool(initializer=_init_render_state, initargs=init_args) as pool:
+            encode(pool.imap(_render_spec, specs, chunksize=4))
+    else:
+        _init_render_state(*init_args)
+        encode(map(_render_spec, specs))
 
-    frames[0].save(
-        output_path,
-        save_all=True,
-        append_images=frames[1:],
-        duration=durations,
-        loop=0  # Loop forever
-    )
+    return len(specs)
 
-    return len(frames)
+
+def postprocess_gif(path: str) -> None:
+    """Re-optimize an encoded GIF with an external frame optimizer.
+
+    gifsicle (preferred) and ImageMagick both rewrite regions that are
+    identical across consecutive frames as transparent deltas, shrinking
+    the file beyond what Pillow's encoder emits.
+    """
+    before = os.path.getsize(path)
+    tmp = path + '.opt'
+    if shutil.which('gifsicle'):
+        subprocess.run(['gifsicle', '-O3', '--lossy=30', '-o', tmp, path], check=True)
+    elif shutil.which('convert'):
+        subprocess.run(['convert', path, '-fuzz', '3%', '-layers', 'OptimizeFrame', tmp], check=True)
+    else:
+        print("Postprocess skipped: neither gifsicle nor ImageMagick found")
+        return
+    os.replace(tmp, path)
+    after = os.path.getsize(path)
+    print(f"Postprocessed {path}: {before} → {after} bytes ({1 - after / before:.0%} smaller)")
 
 
 def main():
@@ -373,6 +494,8 @@ def main():
     parser.add_argument("--width", type=int, default=700, help="GIF width")
     parser.add_argument("--height", type=int, default=350, help="GIF height")
     parser.add_argument("--speed", type=int, default=800, help="Frame duration in ms")
+    parser.add_argument("--postprocess", action=argparse.BooleanOptionalAction, default=False,
+                        help="Re-optimize the GIF with gifsicle/ImageMagick after saving")
     args = parser.parse_args()
 
     # Import TCT
@@ -404,6 +527,9 @@ def main():
         args.speed
     )
 
+    if args.postprocess:
+        postprocess_gif(args.output)
+
     print(f"Generated {args.output}")
     print(f"  Input: {args.json}")
     print(f"  Tokens: {tokens}")
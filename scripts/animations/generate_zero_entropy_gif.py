@@ -5,6 +5,10 @@ Shows how TCT skips predicting deterministic syntax, focusing only on semantic d
 """
 
 import argparse
+import multiprocessing
+import os
+from functools import lru_cache
+
 from PIL import Image, ImageDraw, ImageFont
 
 
@@ -26,19 +30,61 @@ def hex_to_rgb(hex_color: str) -> tuple:
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
+# RGB tuples precomputed once so frame drawing does plain dict lookups
+COLORS_RGB = {k: hex_to_rgb(v) for k, v in COLORS.items()}
+
+
+# First monospace font that exists, resolved once at import so
+# get_font doesn't re-walk the candidate paths for every size
+_FONT_PATH = next((p for p in [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
+] if os.path.exists(p)), None)
+
+
+@lru_cache(maxsize=16)
 def get_font(size: int) -> ImageFont.FreeTypeFont:
-    font_paths = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
-    ]
-    for path in font_paths:
+    if _FONT_PATH:
         try:
-            return ImageFont.truetype(path, size)
+            return ImageFont.truetype(_FONT_PATH, size)
         except (IOError, OSError):
-            continue
+            pass
     return ImageFont.load_default()
 
 
+@lru_cache(maxsize=512)
+def _text_w(text: str, font: ImageFont.FreeTypeFont) -> float:
+    """Width of text in the given font, cached across frames.
+
+    font.getlength is cheaper than draw.textbbox for width-only
+    queries, and each token text is measured dozens of times per GIF.
+    """
+    return font.getlength(text)
+
+
+# The example tokens: (text, type, description)
+# type: 'syntax' = deterministic, 'semantic' = model predicts
+# {"kind": "Pod", "name": "nginx"}
+TOKENS = [
+    ('{', 'syntax', 'auto'),
+    ('"kind"', 'syntax', 'auto'),
+    (':', 'syntax', 'auto'),
+    ('"', 'syntax', 'auto'),
+    ('Pod', 'semantic', 'predict'),
+    ('"', 'syntax', 'auto'),
+    (',', 'syntax', 'auto'),
+    ('"name"', 'syntax', 'auto'),
+    (':', 'syntax', 'auto'),
+    ('"', 'syntax', 'auto'),
+    ('nginx', 'semantic', 'predict'),
+    ('"', 'syntax', 'auto'),
+    ('}', 'syntax', 'auto'),
+]
+
+TOTAL_SYNTAX = sum(1 for _, t, _ in TOKENS if t == 'syntax')
+TOTAL_SEMANTIC = sum(1 for _, t, _ in TOKENS if t == 'semantic')
+
+
 def create_frame(
     width: int,
     height: int,
@@ -50,105 +96,87 @@ def create_frame(
 ) -> Image.Image:
     """Create a frame showing zero-entropy elimination."""
 
-    img = Image.new('RGB', (width, height), hex_to_rgb(COLORS['bg']))
+    img = Image.new('RGB', (width, height), COLORS_RGB['bg'])
     draw = ImageDraw.Draw(img)
 
     padding = 25
     y = padding
 
     # Title
-    draw.text((padding, y), "Zero-Entropy Elimination", font=font_title, fill=hex_to_rgb(COLORS['text']))
+    draw.text((padding, y), "Zero-Entropy Elimination", font=font_title, fill=COLORS_RGB['text'])
     y += 40
 
     # Explanation
     draw.text((padding, y), "TCT skips predicting deterministic syntax - models only predict at decision points",
-              font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+              font=font_small, fill=COLORS_RGB['text_dim'])
     y += 35
 
-    # The JSON structure with annotations
-    # {"kind": "Pod", "name": "nginx"}
-
-    # Define tokens: (text, type, description)
-    # type: 'syntax' = deterministic, 'semantic' = model predicts
-    tokens = [
-        ('{', 'syntax', 'auto'),
-        ('"kind"', 'syntax', 'auto'),
-        (':', 'syntax', 'auto'),
-        ('"', 'syntax', 'auto'),
-        ('Pod', 'semantic', 'predict'),
-        ('"', 'syntax', 'auto'),
-        (',', 'syntax', 'auto'),
-        ('"name"', 'syntax', 'auto'),
-        (':', 'syntax', 'auto'),
-        ('"', 'syntax', 'auto'),
-        ('nginx', 'semantic', 'predict'),
-        ('"', 'syntax', 'auto'),
-        ('}', 'syntax', 'auto'),
-    ]
+    tokens = TOKENS
 
     # Calculate which tokens to show
     visible_tokens = min(step, len(tokens))
 
     # Draw section header
-    draw.line([(padding, y), (width - padding, y)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, y), (width - padding, y)], fill=COLORS_RGB['border'], width=1)
     y += 15
 
     # Legend
     legend_y = y
-    draw.rectangle([padding, legend_y, padding + 12, legend_y + 12], fill=hex_to_rgb(COLORS['syntax']))
-    draw.text((padding + 18, legend_y - 2), "Syntax (auto-emitted)", font=font_small, fill=hex_to_rgb(COLORS['syntax']))
+    draw.rectangle([padding, legend_y, padding + 12, legend_y + 12], fill=COLORS_RGB['syntax'])
+    draw.text((padding + 18, legend_y - 2), "Syntax (auto-emitted)", font=font_small, fill=COLORS_RGB['syntax'])
 
-    draw.rectangle([padding + 200, legend_y, padding + 212, legend_y + 12], fill=hex_to_rgb(COLORS['semantic']))
-    draw.text((padding + 218, legend_y - 2), "Semantic (model predicts)", font=font_small, fill=hex_to_rgb(COLORS['semantic']))
+    draw.rectangle([padding + 200, legend_y, padding + 212, legend_y + 12], fill=COLORS_RGB['semantic'])
+    draw.text((padding + 218, legend_y - 2), "Semantic (model predicts)", font=font_small, fill=COLORS_RGB['semantic'])
     y += 30
 
     # Draw JSON with colored tokens
     json_y = y + 10
-    cursor_x = padding
 
+    # Coalesce consecutive same-color tokens into one draw.text call
+    # each; the font is monospace, so a joined run renders the same
+    # glyphs as drawing its tokens one by one
+    runs = []  # [color key, joined text]
     for i, (text, token_type, desc) in enumerate(tokens):
         if i >= visible_tokens:
-            # Draw placeholder
-            bbox = draw.textbbox((0, 0), text, font=font)
-            text_width = bbox[2] - bbox[0]
-            draw.text((cursor_x, json_y), "░" * len(text), font=font, fill=hex_to_rgb(COLORS['border']))
-            cursor_x += text_width + 2
-            continue
+            token_type, text = 'border', '░' * len(text)
+        if runs and runs[-1][0] == token_type:
+            runs[-1][1] += text
+        else:
+            runs.append([token_type, text])
 
-        color = COLORS['syntax'] if token_type == 'syntax' else COLORS['semantic']
-
-        # Highlight current token
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-
-        if i == visible_tokens - 1:
-            # Current token - add background highlight
-            draw.rectangle([cursor_x - 2, json_y - 2, cursor_x + text_width + 2, json_y + 18],
-                          fill=hex_to_rgb(COLORS['box_bg']),
-                          outline=hex_to_rgb(color), width=2)
+    # Background highlight for the newest token, drawn under the runs
+    if visible_tokens > 0:
+        hl_text, hl_type, _ = tokens[visible_tokens - 1]
+        hl_x = padding + _text_w(''.join(t for t, _, _ in tokens[:visible_tokens - 1]), font)
+        hl_w = _text_w(hl_text, font)
+        draw.rectangle([hl_x - 2, json_y - 2, hl_x + hl_w + 2, json_y + 18],
+                      fill=COLORS_RGB['box_bg'],
+                      outline=COLORS_RGB[hl_type], width=2)
 
-        draw.text((cursor_x, json_y), text, font=font, fill=hex_to_rgb(color))
-        cursor_x += text_width + 2
+    cursor_x = padding
+    for color_key, segment in runs:
+        draw.text((cursor_x, json_y), segment, font=font, fill=COLORS_RGB[color_key])
+        cursor_x += _text_w(segment, font)
 
     y = json_y + 50
 
     # Stats section
-    draw.line([(padding, y), (width - padding, y)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, y), (width - padding, y)], fill=COLORS_RGB['border'], width=1)
     y += 15
 
     # Count syntax vs semantic tokens shown
     syntax_count = sum(1 for i, (_, t, _) in enumerate(tokens) if i < visible_tokens and t == 'syntax')
     semantic_count = sum(1 for i, (_, t, _) in enumerate(tokens) if i < visible_tokens and t == 'semantic')
 
-    total_syntax = sum(1 for _, t, _ in tokens if t == 'syntax')
-    total_semantic = sum(1 for _, t, _ in tokens if t == 'semantic')
+    total_syntax = TOTAL_SYNTAX
+    total_semantic = TOTAL_SEMANTIC
 
     # Draw counters
-    draw.text((padding, y), "Syntax tokens (skipped):", font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
-    draw.text((padding + 180, y), f"{syntax_count}/{total_syntax}", font=font, fill=hex_to_rgb(COLORS['syntax']))
+    draw.text((padding, y), "Syntax tokens (skipped):", font=font_small, fill=COLORS_RGB['text_dim'])
+    draw.text((padding + 180, y), f"{syntax_count}/{total_syntax}", font=font, fill=COLORS_RGB['syntax'])
 
-    draw.text((padding + 280, y), "Semantic tokens (predicted):", font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
-    draw.text((padding + 480, y), f"{semantic_count}/{total_semantic}", font=font, fill=hex_to_rgb(COLORS['semantic']))
+    draw.text((padding + 280, y), "Semantic tokens (predicted):", font=font_small, fill=COLORS_RGB['text_dim'])
+    draw.text((padding + 480, y), f"{semantic_count}/{total_semantic}", font=font, fill=COLORS_RGB['semantic'])
     y += 35
 
     # Progress bar showing predictions saved
@@ -158,7 +186,7 @@ def create_frame(
 
         # Total bar
         draw.rectangle([padding, bar_y, padding + bar_width, bar_y + 20],
-                      fill=hex_to_rgb(COLORS['box_bg']))
+                      fill=COLORS_RGB['box_bg'])
 
         # Show proportion
         total_shown = syntax_count + semantic_count
@@ -167,9 +195,9 @@ def create_frame(
             semantic_width = int((semantic_count / total_shown) * bar_width)
 
             draw.rectangle([padding, bar_y, padding + syntax_width, bar_y + 20],
-                          fill=hex_to_rgb(COLORS['syntax']))
+                          fill=COLORS_RGB['syntax'])
             draw.rectangle([padding + syntax_width, bar_y, padding + syntax_width + semantic_width, bar_y + 20],
-                          fill=hex_to_rgb(COLORS['semantic']))
+                          fill=COLORS_RGB['semantic'])
 
         y += 30
 
@@ -178,47 +206,66 @@ def create_frame(
             pct_saved = (syntax_count / total_shown) * 100
             draw.text((padding, y),
                      f"TCT eliminates {pct_saved:.0f}% of predictions (zero-entropy syntax)",
-                     font=font, fill=hex_to_rgb(COLORS['success']))
+                     font=font, fill=COLORS_RGB['success'])
 
     # Footer
     footer_y = height - 35
-    draw.line([(padding, footer_y - 10), (width - padding, footer_y - 10)], fill=hex_to_rgb(COLORS['border']), width=1)
+    draw.line([(padding, footer_y - 10), (width - padding, footer_y - 10)], fill=COLORS_RGB['border'], width=1)
     draw.text((padding, footer_y), "Models focus capacity on semantic decisions, not mandatory syntax",
-              font=font_small, fill=hex_to_rgb(COLORS['text_dim']))
+              font=font_small, fill=COLORS_RGB['text_dim'])
 
     return img
 
 
-def generate_animation(output_path: str, width: int = 750, height: int = 380):
-    """Generate the zero-entropy elimination GIF."""
+# Per-process render state; fonts don't pickle, so Pool workers rebuild
+# them from the plain arguments via the initializer
+_RENDER = {}
 
-    font = get_font(16)
-    font_small = get_font(12)
-    font_title = get_font(20)
 
-    frames = []
-    total_tokens = 13  # Number of tokens in our example
+def _init_render_state(width, height):
+    """Build the shared render state for this process."""
+    _RENDER.update(
+        width=width, height=height,
+        fonts=(get_font(16), get_font(12), get_font(20)),
+    )
+
+
+def _render_step(step):
+    """Render the frame where the first `step` tokens are visible."""
+    font, font_small, font_title = _RENDER['fonts']
+    return create_frame(_RENDER['width'], _RENDER['height'], step, len(TOKENS),
+                        font, font_small, font_title)
 
-    # Initial frame
-    for _ in range(5):
-        frame = create_frame(width, height, 0, total_tokens, font, font_small, font_title)
-        frames.append(frame)
 
-    # Animate tokens appearing
-    for step in range(1, total_tokens + 1):
-        for _ in range(3):  # Hold each step for 3 frames
-            frame = create_frame(width, height, step, total_tokens, font, font_small, font_title)
-            frames.append(frame)
+def generate_animation(output_path: str, width: int = 750, height: int = 380):
+    """Generate the zero-entropy elimination GIF."""
 
-    # Hold final
-    for _ in range(20):
-        frames.append(frames[-1])
+    total_tokens = len(TOKENS)
+    frame_duration = 120
+
+    # One frame per distinct state; holds are expressed as per-frame
+    # durations instead of duplicate frames the encoder would re-encode
+    steps = list(range(total_tokens + 1))
+    durations = [frame_duration * 3] * len(steps)
+    durations[0] = frame_duration * 5
+    # Hold final (previously 20 duplicated frames)
+    durations[-1] += frame_duration * 20
+
+    # Frames are pure functions of their step: fan rendering out across
+    # cores and assemble in order
+    init_args = (width, height)
+    if multiprocessing.cpu_count() > 1:
+        with multiprocessing.Pool(initializer=_init_render_state, initargs=init_args) as pool:
+            frames = pool.map(_render_step, steps, chunksize=4)
+    else:
+        _init_render_state(*init_args)
+        frames = [_render_step(s) for s in steps]
 
     frames[0].save(
         output_path,
         save_all=True,
         append_images=frames[1:],
-        duration=120,
+        duration=durations,
         loop=0
     )
 